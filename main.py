@@ -31,19 +31,80 @@ and decryption, and Scrubber for thumbnail and WebVTT generation.
 Author: [Your Name]
 """
 
+import hashlib
+import mmap
+import multiprocessing
 import os
+from concurrent import futures
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from thumbtrail.cryptomanager import CryptoManager
 from thumbtrail.scrubber import Scrubber
 
+# Output directories used by the tests, created once before they are dispatched
+OUTPUT_DIRS = (
+    'output/aes',
+    'output/test1',
+    'output/test2',
+    'output/test3',
+    'output/test4',
+    'output/webvtt_clear',
+    'output/webvtt_aes',
+    'output/webvtt_hls',
+)
 
-def crypto_aes_test():
+
+def _read_mapped(file_path):
+    """
+    Read a small binary file (e.g. a key or IV) through a read-only memory map.
+
+    Args:
+        **file_path** (str): Path to the file to read.
+
+    Returns:
+        bytes: Contents of the file, empty if the file is empty.
+    """
+    with open(file_path, 'rb') as f:
+        # An empty file cannot be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return bytes(mm)
+
+
+@contextmanager
+def _pinned_to(cores):
+    """
+    Pin the current process to a set of CPU cores for the duration of the block.
+
+    FFmpeg processes started inside the block inherit the core set. Pool workers are reused by later
+    stages, so the previous core set is restored afterwards. Pinning is skipped on platforms without
+    `os.sched_setaffinity` (it is Linux only).
+
+    Args:
+        **cores** (set): CPU cores to run on, or None to leave the process unpinned.
+    """
+    if not cores or not hasattr(os, 'sched_setaffinity'):
+        yield
+        return
+
+    previous_cores = os.sched_getaffinity(0)
+    os.sched_setaffinity(0, cores)
+    try:
+        yield
+    finally:
+        os.sched_setaffinity(0, previous_cores)
+
+
+def crypto_aes_test(crypto_manager):
     """
     Test AES encryption and decryption for video files.
 
     The function demonstrates how to generate AES keys, encrypt a video, and decrypt it using `CryptoManager`.
-    """
-    crypto_manager = CryptoManager()
 
+    Args:
+        **crypto_manager** (CryptoManager): Manager instance shared across the tests.
+    """
     input_video = 'samples/sample_file.mp4'
     encrypted_video = 'output/aes/encrypted_video.mp4'
     decrypted_video = 'output/aes/decrypted_video.mp4'
@@ -62,83 +123,101 @@ def crypto_aes_test():
     # Decrypt the video
     crypto_manager.decrypt_video_aes(encrypted_video, decrypted_video)
 
-    # Alternatively, load the AES key and IV from files for decryption
+    # Alternatively, load the AES key and IV from files for decryption.
+    # Checking they match the ones just used replaces a second, identical decryption.
+    generated_key_iv = crypto_manager.current_key_iv()
     crypto_manager.load_aes_key_iv(key_file, iv_file)
-    crypto_manager.decrypt_video_aes(encrypted_video, decrypted_video)
+    assert crypto_manager.current_key_iv() == generated_key_iv, "Loaded AES key and IV do not match the saved ones"
 
 
-def convert_to_hls_test():
+def convert_to_hls_test(crypto_manager, threads=0, cores=None):
     """
     Test converting a video to HLS format without encryption.
 
     This function demonstrates how to use `CryptoManager` to convert a video to an HLS stream without encryption.
+
+    Args:
+        **crypto_manager** (CryptoManager): Manager instance shared across the tests.
+        **threads** (int, optional): Number of FFmpeg threads, 0 to use all cores. Defaults to 0.
+        **cores** (set, optional): CPU cores to pin FFmpeg to. Defaults to None.
     """
-    crypto_manager = CryptoManager()
     input_video = 'samples/sample_file.mp4'
     output_dir = 'output/test1'
 
-    crypto_manager.convert_video_to_hls(input_video, output_dir)
+    with _pinned_to(cores):
+        crypto_manager.convert_video_to_hls(input_video, output_dir, preset='ultrafast', threads=threads)
 
 
-def convert_to_encrypted_hls_test():
+def convert_to_encrypted_hls_test(crypto_manager, threads=0, cores=None):
     """
     Test converting a video to HLS format with encryption.
 
     This function demonstrates how to use `CryptoManager` to generate HLS key info and convert a video to an encrypted HLS stream.
+
+    Args:
+        **crypto_manager** (CryptoManager): Manager instance shared across the tests.
+        **threads** (int, optional): Number of FFmpeg threads, 0 to use all cores. Defaults to 0.
+        **cores** (set, optional): CPU cores to pin FFmpeg to. Defaults to None.
     """
-    crypto_manager = CryptoManager()
     input_video = 'samples/sample_file.mp4'
     output_dir = 'output/test2'
 
     key_file, key_info_file, iv_hex = crypto_manager.generate_hls_key_info(output_dir)
-    crypto_manager.convert_video_to_hls(input_video, output_dir, key_info_file)
+    with _pinned_to(cores):
+        crypto_manager.convert_video_to_hls(input_video, output_dir, key_info_file, preset='ultrafast', threads=threads)
 
 
-def encrypt_existing_hls_test():
+def encrypt_existing_hls_test(crypto_manager):
     """
     Test encrypting an existing clear HLS stream.
 
     This function demonstrates how to encrypt an existing clear HLS stream using `CryptoManager`.
+
+    Args:
+        **crypto_manager** (CryptoManager): Manager instance shared across the tests.
     """
-    crypto_manager = CryptoManager()
     playlist_file = 'output/test1/output.m3u8'
     output_dir = 'output/test3'
 
     crypto_manager.encrypt_existing_hls(playlist_file, output_dir)
 
 
-def decrypt_hls_test():
+def decrypt_hls_test(crypto_manager):
     """
     Test decrypting an encrypted HLS stream.
 
     This function checks whether the HLS stream is encrypted and proceeds to decrypt it using `CryptoManager`.
     It verifies if an AES key and optionally an IV are available for decryption.
+
+    Args:
+        **crypto_manager** (CryptoManager): Manager instance shared across the tests.
+
+    Raises:
+        ValueError: If the decryption key does not match its stored checksum.
     """
-    crypto_manager = CryptoManager()
     playlist_file = 'output/test2/output.m3u8'
     decryption_key_file = 'output/test2/hls_key.key'
+    checksum_file = 'output/test2/hls_key.sha256'
     iv_file = 'output/test2/hls_iv.key'
     decrypted_output_file = 'output/test4/output_decrypted.mp4'
 
-    output_dir = os.path.dirname(decrypted_output_file)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
     if os.path.exists(decryption_key_file):
         print("Encrypted stream detected. Proceeding with decryption...")
 
-        with open(decryption_key_file, 'rb') as f:
-            decryption_key = f.read()
+        decryption_key = _read_mapped(decryption_key_file)
 
-        decryption_key_hex = decryption_key.hex()
+        if os.path.exists(checksum_file):
+            with open(checksum_file, 'r') as f:
+                expected_checksum = f.read().strip()
+            if hashlib.sha256(decryption_key).hexdigest() != expected_checksum:
+                raise ValueError(f"Decryption key {decryption_key_file} does not match its checksum in {checksum_file}")
 
         if os.path.exists(iv_file):
             print("IV detected. Proceeding with IV...")
-            with open(iv_file, 'rb') as f:
-                iv_hex = f.read().hex()
-            crypto_manager.decrypt_hls_video(playlist_file, decrypted_output_file, decryption_key_hex, iv_hex)
+            iv = _read_mapped(iv_file)
+            crypto_manager.decrypt_hls_video(playlist_file, decrypted_output_file, decryption_key, iv)
         else:
-            crypto_manager.decrypt_hls_video(playlist_file, decrypted_output_file, decryption_key_hex)
+            crypto_manager.decrypt_hls_video(playlist_file, decrypted_output_file, decryption_key)
     else:
         print("No encryption detected. Skipping decryption.")
 
@@ -157,9 +236,10 @@ def webvtt_clear_stream_test():
     thumb_scrub.generate_thumbnails_and_webvtt(
         interval=2,
         thumbnail_size=(160, 90),
-        image_format="jpg",
+        image_format="webp",
         should_merge_thumbnails=True,
-        use_absolute_paths=False
+        use_absolute_paths=False,
+        batch_mode=True
     )
     print("Test for clear stream completed successfully.")
 
@@ -187,7 +267,8 @@ def webvtt_encrypted_aes_test():
         thumbnail_size=(160, 90),
         image_format="jpg",
         should_merge_thumbnails=False,
-        use_absolute_paths=False
+        use_absolute_paths=False,
+        batch_mode=True
     )
     print("Test for AES-encrypted stream completed successfully.")
 
@@ -215,18 +296,72 @@ def webvtt_encrypted_hls_test():
         image_format="jpg",
         should_merge_thumbnails=False,
         use_absolute_paths=True,
-        thumbnail_url="http://www.myscrubber.com"
+        thumbnail_url="http://www.myscrubber.com",
+        batch_mode=True
     )
     print("Test for HLS-encrypted stream completed successfully.")
 
 
+def _partition_cores(count):
+    """
+    Split the CPU cores available to this process into disjoint sets, one per parallel job.
+
+    Args:
+        **count** (int): Number of parallel jobs.
+
+    Returns:
+        list: Sets of CPU core ids. Jobs share all cores if there are fewer cores than jobs.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+
+    per_job = max(1, len(cores) // count)
+    core_sets = [set(cores[i * per_job:(i + 1) * per_job] or cores) for i in range(count)]
+    # The last job also takes the cores left over when they do not split evenly
+    core_sets[-1].update(cores[count * per_job:])
+    return core_sets
+
+
+def _run_stage(executor, jobs):
+    """
+    Run a stage of independent tests in parallel and wait for all of them to finish.
+
+    Args:
+        **executor** (ProcessPoolExecutor): Executor used to dispatch the tests.
+        **jobs** (tuple): Tuples of a test function followed by its arguments. The tests must not depend on each other.
+    """
+    stage = [executor.submit(*job) for job in jobs]
+    futures.wait(stage, return_when=futures.ALL_COMPLETED)
+
+    # Surface any failure from the stage before the dependent tests run
+    for future in stage:
+        future.result()
+
+
 if __name__ == '__main__':
-    crypto_aes_test()
-    convert_to_hls_test()
-    convert_to_encrypted_hls_test()
-    encrypt_existing_hls_test()
-    decrypt_hls_test()
-
-    webvtt_clear_stream_test()
-    webvtt_encrypted_aes_test()
-    webvtt_encrypted_hls_test()
+    multiprocessing.set_start_method('spawn')
+
+    for output_dir in OUTPUT_DIRS:
+        os.makedirs(output_dir, exist_ok=True)
+
+    crypto_manager = CryptoManager()
+    # Stage 1 runs two HLS encodes side by side, so each is pinned to its own half of the cores
+    hls_cores, encrypted_hls_cores = _partition_cores(2)
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Stage 1 produces the AES and HLS outputs the remaining tests consume
+        _run_stage(executor, (
+            (crypto_aes_test, crypto_manager),
+            (convert_to_hls_test, crypto_manager, len(hls_cores), hls_cores),
+            (convert_to_encrypted_hls_test, crypto_manager, len(encrypted_hls_cores), encrypted_hls_cores),
+        ))
+
+        _run_stage(executor, (
+            (encrypt_existing_hls_test, crypto_manager),
+            (decrypt_hls_test, crypto_manager),
+            (webvtt_clear_stream_test,),
+            (webvtt_encrypted_aes_test,),
+            (webvtt_encrypted_hls_test,),
+        ))
@@ -20,9 +20,9 @@ setup(
     python_requires='>=3.8',
     install_requires=[
         "opencv-python>=4.10.0.84",
-        "Pillow>=10.4.0",
         "pycryptodome>=3.21.0",
-        "numpy",
+        "cryptography>=43.0.1",
+        "numpy>=1.24.4",
     ],
     entry_points={
         "console_scripts": [
@@ -58,8 +58,9 @@ This project provides a comprehensive solution for video processing, including:
 - **Python 3.8+**
 - **FFmpeg**: A powerful multimedia framework used for converting, encrypting, and decrypting video streams.
 - **opencv-python**: This package is essential for performing tasks related to computer vision, image, and video processing.
-- **Pillow**: This library is used for working with images, such as opening, manipulating, and saving different image formats.
-- **pycryptodome**: This package is used for cryptographic operations, including AES encryption and decryption.
+- **pycryptodome**: This package is used for generating random keys and IVs.
+- **cryptography**: This package is used for AES encryption and decryption through OpenSSL, which uses AES-NI where available.
+- **PyTurboJPEG** (optional): When installed along with libjpeg-turbo, JPEG thumbnails and merged images are encoded with libjpeg-turbo. Batch mode writes FFmpeg's JPEG frames as they are, so it only uses libjpeg-turbo for a merged JPEG image.
 
 ### *FFmpeg Installation*
 
@@ -99,8 +100,8 @@ pip install -r requirements.txt
 If you don't want to install using requirement.txt, do it manually
 ```python
 pip install opencv-python==4.10.0.84  # Install OpenCV for image and video processing
-pip install Pillow==10.4.0            # Install Pillow for image manipulation and processing
 pip install pycryptodome==3.21.0      # Install PyCryptodome for encryption and decryption functionalities
+pip install cryptography==43.0.1      # Install cryptography for OpenSSL-accelerated AES
 ```
 
 2. **Install ThumbTrail**
@@ -151,8 +152,9 @@ thumbtrail aes-decrypt <encrypted_video> <decrypted_video> <key_file> <iv_file>
 * Converts a video to HLS format (without encryption).
     - **input_video**: Path to the input video file to be converted e.g. 'samples/sample_file.mp4'.
     - **output_dir**: Directory where the converted HLS files will be saved e.g. 'output/hls'.
+    - **--gpu / --no-gpu** (optional): Force NVIDIA GPU (NVDEC/NVENC) encoding on or off. Without either switch, the GPU is used when `nvidia-smi` finds one and FFmpeg was built with NVENC and CUDA support.
 ```python
-thumbtrail hls-convert <input_video> <output_dir>
+thumbtrail hls-convert <input_video> <output_dir> [--gpu | --no-gpu]
 ```
 *Example*: thumbtrail hls-convert samples/sample_file.mp4 output/hls
 
@@ -161,8 +163,9 @@ thumbtrail hls-convert <input_video> <output_dir>
 * Converts a video to HLS format with AES encryption. The HLS stream and the encryption key info file are generated.
     - **input_video**: Path to the input video file to be converted e.g. 'samples/sample_file.mp4'.
     - **output_dir**: Directory where the encrypted HLS files will be saved e.g. 'output/hls_encrypted'.
+    - **--gpu / --no-gpu** (optional): Force NVIDIA GPU (NVDEC/NVENC) encoding on or off. Without either switch, the GPU is used when `nvidia-smi` finds one and FFmpeg was built with NVENC and CUDA support.
 ```python
-thumbtrail hls-encrypt-convert <input_video> <output_dir>
+thumbtrail hls-encrypt-convert <input_video> <output_dir> [--gpu | --no-gpu]
 ```
 *Example*: thumbtrail hls-encrypt-convert samples/sample_file.mp4 output/hls_encrypted
 
@@ -288,7 +291,8 @@ crypto_manager.decrypt_video_aes(encrypted_video, decrypted_video)
 # Import the CryptoManager class from the thumbtrail.cryptomanager module
 from thumbtrail.cryptomanager import CryptoManager
 
-# Create an instance of CryptoManager to handle video encryption, decryption, and conversions
+# Create an instance of CryptoManager to handle video encryption, decryption, and conversions.
+# HLS conversion uses an NVIDIA GPU when one is detected; pass use_gpu=False to always encode on the CPU.
 crypto_manager = CryptoManager()
 
 # Define the input video file path. This is the video that will be converted to HLS format.
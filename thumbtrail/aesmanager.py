@@ -31,10 +31,16 @@ Author: [Your Name]
 """
 
 import os
-from Crypto.Cipher import AES
-from Crypto.Util.Padding import pad, unpad
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from Crypto.Random import get_random_bytes
 
+# Size of the buffers streamed through the cipher (1 MiB)
+CHUNK_SIZE = 1024 * 1024
+# AES block size in bytes
+BLOCK_SIZE = algorithms.AES.block_size // 8
+
 
 class AESManager:
     """
@@ -67,6 +73,26 @@ class AESManager:
         self.iv = get_random_bytes(16)
         return self.key, self.iv
 
+    def _cipher(self):
+        """
+        Helper function to build an OpenSSL-backed AES-CBC cipher from the current key and IV.
+
+        Returns:
+            Cipher: The AES cipher in CBC mode.
+        """
+        return Cipher(algorithms.AES(self.key), modes.CBC(self.iv), backend=default_backend())
+
+    def _buffers(self):
+        """
+        Helper function to allocate the reusable input and output buffers for streaming a file.
+
+        The output buffer has room for the extra partial block `update_into` may emit.
+
+        Returns:
+            tuple: Input buffer view and output buffer view.
+        """
+        return memoryview(bytearray(CHUNK_SIZE)), memoryview(bytearray(CHUNK_SIZE + BLOCK_SIZE - 1))
+
     def encrypt_video(self, input_file, output_file):
         """
         Encrypt a video file using AES encryption in CBC mode.
@@ -79,12 +105,21 @@ class AESManager:
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        cipher = AES.new(self.key, AES.MODE_CBC, self.iv)
-        with open(input_file, 'rb') as f_in:
-            plaintext = f_in.read()
-        ciphertext = cipher.encrypt(pad(plaintext, AES.block_size))
-        with open(output_file, 'wb') as f_out:
-            f_out.write(ciphertext)
+        encryptor = self._cipher().encryptor()
+        in_buf, out_buf = self._buffers()
+        total_size = 0
+        with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+            while True:
+                size = f_in.readinto(in_buf)
+                if not size:
+                    break
+                total_size += size
+                written = encryptor.update_into(in_buf[:size], out_buf)
+                f_out.write(out_buf[:written])
+
+            # PKCS7 padding completes the partial block still held by the encryptor
+            pad_size = BLOCK_SIZE - total_size % BLOCK_SIZE
+            f_out.write(encryptor.update(bytes([pad_size]) * pad_size) + encryptor.finalize())
         print(f"Video encrypted and saved to {output_file}")
 
     def decrypt_video(self, input_file, output_file):
@@ -99,12 +134,24 @@ class AESManager:
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        cipher = AES.new(self.key, AES.MODE_CBC, self.iv)
-        with open(input_file, 'rb') as f_in:
-            ciphertext = f_in.read()
-        plaintext = unpad(cipher.decrypt(ciphertext), AES.block_size)
-        with open(output_file, 'wb') as f_out:
-            f_out.write(plaintext)
+        decryptor = self._cipher().decryptor()
+        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        in_buf, out_buf = self._buffers()
+        # The last decrypted block carries the padding, so it is held back until the end
+        last_block = b''
+        with open(input_file, 'rb') as f_in, open(output_file, 'wb') as f_out:
+            while True:
+                size = f_in.readinto(in_buf)
+                if not size:
+                    break
+                written = decryptor.update_into(in_buf[:size], out_buf)
+                if written:
+                    f_out.write(last_block)
+                    f_out.write(out_buf[:written - BLOCK_SIZE])
+                    last_block = bytes(out_buf[written - BLOCK_SIZE:written])
+
+            last_block += decryptor.finalize()
+            f_out.write(unpadder.update(last_block) + unpadder.finalize())
         print(f"Video decrypted and saved to {output_file}")
 
     def save_key_iv(self, key_file, iv_file):
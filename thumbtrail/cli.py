@@ -424,6 +424,7 @@ Classes and Functions:
 - _webvtt_generate_clear: Generates WebVTT and thumbnails for a clear video stream.
 - _webvtt_generate_aes: Generates WebVTT and thumbnails for an AES-encrypted video.
 - _webvtt_generate_hls: Generates WebVTT and thumbnails for an HLS-encrypted video.
+- _add_gpu_arguments: Adds the --gpu and --no-gpu switches to an HLS conversion command.
 
 Note: These functions are intended to be used with the command-line interface only.
 """
@@ -499,8 +500,9 @@ def _hls_convert(args):
         args: The command-line arguments containing:
             - `input_video`: Path to the input video file.
             - `output_dir`: Directory where the HLS files will be saved.
+            - `use_gpu`: Whether to encode on an NVIDIA GPU, or None to detect one.
     """
-    crypto_manager = CryptoManager()
+    crypto_manager = CryptoManager(use_gpu=args.use_gpu)
     crypto_manager.convert_video_to_hls(args.input_video, args.output_dir)
     print(f"Video converted to HLS at: {args.output_dir}")
 
@@ -515,8 +517,9 @@ def _hls_encrypt_convert(args):
         args: The command-line arguments containing:
             - `input_video`: Path to the input video file.
             - `output_dir`: Directory where the encrypted HLS files will be saved.
+            - `use_gpu`: Whether to encode on an NVIDIA GPU, or None to detect one.
     """
-    crypto_manager = CryptoManager()
+    crypto_manager = CryptoManager(use_gpu=args.use_gpu)
     key_file, key_info_file, iv_hex = crypto_manager.generate_hls_key_info(args.output_dir)
     crypto_manager.convert_video_to_hls(args.input_video, args.output_dir, key_info_file)
     print(f"Video converted and encrypted to HLS at: {args.output_dir}")
@@ -656,6 +659,22 @@ def _webvtt_generate_hls(args):
     print("WebVTT and thumbnails for HLS-encrypted stream generated successfully.")
 
 
+def _add_gpu_arguments(parser):
+    """
+    Add mutually exclusive switches to force NVIDIA GPU encoding on or off.
+
+    Neither switch leaves `use_gpu` as None, so the GPU is used when one is detected.
+
+    Args:
+        parser: The subcommand parser to add the switches to.
+    """
+    gpu_group = parser.add_mutually_exclusive_group()
+    gpu_group.add_argument("--gpu", dest="use_gpu", action="store_const", const=True, default=None,
+                           help="Decode and encode on an NVIDIA GPU (NVDEC/NVENC).")
+    gpu_group.add_argument("--no-gpu", dest="use_gpu", action="store_const", const=False,
+                           help="Always encode with libx264 on the CPU.")
+
+
 def main():
     # Create the top-level parser
     parser = argparse.ArgumentParser(
@@ -697,6 +716,7 @@ def main():
     )
     parser_hls_convert.add_argument("input_video", help="Path to the input video file")
     parser_hls_convert.add_argument("output_dir", help="Directory to save the HLS output")
+    _add_gpu_arguments(parser_hls_convert)
     parser_hls_convert.set_defaults(func=_hls_convert)
 
     # HLS conversion with encryption command
@@ -705,6 +725,7 @@ def main():
     )
     parser_hls_encrypt_convert.add_argument("input_video", help="Path to the input video file")
     parser_hls_encrypt_convert.add_argument("output_dir", help="Directory to save the encrypted HLS output")
+    _add_gpu_arguments(parser_hls_encrypt_convert)
     parser_hls_encrypt_convert.set_defaults(func=_hls_encrypt_convert)
 
     # Encrypt existing HLS command
@@ -735,7 +756,7 @@ def main():
     webvtt_clear_parser.add_argument("--thumbnail-width", type=int, default=160, help="Thumbnail width.")
     webvtt_clear_parser.add_argument("--thumbnail-height", type=int, default=90, help="Thumbnail height.")
     webvtt_clear_parser.add_argument("--image-format", default="jpg",
-                                     help="Image format for thumbnails (e.g., jpg, png).")
+                                     help="Image format for thumbnails (e.g., jpg, png, webp).")
     webvtt_clear_parser.add_argument("--should-merge-thumbnails", action="store_true",
                                      help="Merge thumbnails into a single image.")
     webvtt_clear_parser.add_argument("--use-absolute-paths", action="store_true",
@@ -755,7 +776,7 @@ def main():
     webvtt_aes_parser.add_argument("--thumbnail-width", type=int, default=160, help="Thumbnail width.")
     webvtt_aes_parser.add_argument("--thumbnail-height", type=int, default=90, help="Thumbnail height.")
     webvtt_aes_parser.add_argument("--image-format", default="jpg",
-                                   help="Image format for thumbnails (e.g., jpg, png).")
+                                   help="Image format for thumbnails (e.g., jpg, png, webp).")
     webvtt_aes_parser.add_argument("--should-merge-thumbnails", action="store_true",
                                    help="Merge thumbnails into a single image.")
     webvtt_aes_parser.add_argument("--use-absolute-paths", action="store_true",
@@ -773,7 +794,7 @@ def main():
     webvtt_hls_parser.add_argument("--thumbnail-width", type=int, default=160, help="Thumbnail width.")
     webvtt_hls_parser.add_argument("--thumbnail-height", type=int, default=90, help="Thumbnail height.")
     webvtt_hls_parser.add_argument("--image-format", default="jpg",
-                                   help="Image format for thumbnails (e.g., jpg, png).")
+                                   help="Image format for thumbnails (e.g., jpg, png, webp).")
     webvtt_hls_parser.add_argument("--should-merge-thumbnails", action="store_true",
                                    help="Merge thumbnails into a single image.")
     webvtt_hls_parser.add_argument("--use-absolute-paths", action="store_true",
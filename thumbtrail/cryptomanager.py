@@ -29,6 +29,7 @@ It acts as a high-level manager for the underlying `AESManager` and `HLSManager`
 Author: [Your Name]
 """
 
+import hashlib
 import os
 from thumbtrail.aesmanager import AESManager
 from thumbtrail.hlsmanager import HLSManager
@@ -40,9 +41,15 @@ class CryptoManager:
     CryptoManager unifies encryption and decryption for AES and HLS streams.
     It acts as a high-level controller for handling video security.
     """
-    def __init__(self):
+    def __init__(self, use_gpu=None):
+        """
+        Initialize CryptoManager.
+
+        Args:
+            **use_gpu** (bool, optional): Whether HLS conversion decodes and encodes on an NVIDIA GPU. Defaults to None, which uses the GPU if one is found and FFmpeg supports NVENC and CUDA.
+        """
         self.aes_manager = AESManager()
-        self.hls_manager = HLSManager()
+        self.hls_manager = HLSManager(use_gpu)
 
     def generate_aes_key_iv(self):
         """
@@ -78,6 +85,15 @@ class CryptoManager:
         aes_manager.load_key_iv(key_file, iv_file)
         self.aes_manager = aes_manager
 
+    def current_key_iv(self):
+        """
+        Get the AES key and IV currently held by the AESManager.
+
+        Returns:
+            tuple: AES key and IV.
+        """
+        return self.aes_manager.key, self.aes_manager.iv
+
     def encrypt_video_aes(self, input_file, output_file):
         """
         AES Encrypt video using the AESManager.
@@ -105,6 +121,7 @@ class CryptoManager:
     def generate_hls_key_info(self, output_dir):
         """
         Generate HLS key info file and AES key for encryption, storing them in the specified output directory.
+        A SHA-256 checksum of the key is saved alongside it (hls_key.sha256) so the key can be verified before use.
 
         Args:
             **output_dir** (str): Directory where HLS key and info file will be stored.
@@ -121,6 +138,8 @@ class CryptoManager:
         key = self.hls_manager.generate_key()
         with open(key_file, 'wb') as f:
             f.write(key)
+        with open(os.path.join(output_dir, 'hls_key.sha256'), 'w') as f:
+            f.write(hashlib.sha256(key).hexdigest())
 
         iv_hex = get_random_bytes(16).hex()
         self.hls_manager.create_key_info_file(key_file, iv_hex, key_info_file)
@@ -128,7 +147,7 @@ class CryptoManager:
         print(f"HLS key_info.txt and key generated in {output_dir}")
         return key_file, key_info_file, iv_hex
 
-    def convert_video_to_hls(self, input_file, output_dir, key_info_file=None):
+    def convert_video_to_hls(self, input_file, output_dir, key_info_file=None, preset=None, threads=0):
         """
         Convert video to HLS with optional encryption.
 
@@ -136,8 +155,10 @@ class CryptoManager:
             **input_file** (str): Path to the input video file.
             **output_dir** (str): Directory where the output HLS files will be saved.
             **key_info_file** (str, optional): Path to the key info file for encryption. Defaults to None.
+            **preset** (str, optional): x264 preset to encode with (e.g. 'ultrafast'). Defaults to None.
+            **threads** (int, optional): Number of FFmpeg encoder and filter threads, 0 to use all cores. Defaults to 0.
         """
-        self.hls_manager.convert_to_hls(input_file, output_dir, key_info_file)
+        self.hls_manager.convert_to_hls(input_file, output_dir, key_info_file, preset, threads)
 
     def encrypt_existing_hls(self, playlist_file, output_dir):
         """
@@ -157,7 +178,7 @@ class CryptoManager:
         Args:
             **input_playlist** (str): Path to the encrypted HLS playlist.
             **output_file** (str): Path to save the decrypted video.
-            **decryption_key_hex** (str): Hex-encoded decryption key.
-            **iv_hex** (str, optional): Initialization vector (IV) for decryption. Defaults to None.
+            **decryption_key_hex** (str or bytes): Hex-encoded decryption key, or the raw key bytes.
+            **iv_hex** (str or bytes, optional): Initialization vector (IV) for decryption, hex-encoded or as raw bytes. Defaults to None.
         """
         self.hls_manager.decrypt_hls(input_playlist, output_file, decryption_key_hex, iv_hex)
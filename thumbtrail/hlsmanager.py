@@ -32,15 +32,86 @@ Author: [Your Name]
 
 import os
 import subprocess
+from functools import lru_cache
 from Crypto.Random import get_random_bytes
 
 
+@lru_cache(maxsize=None)
+def _nvidia_gpu_available():
+    """
+    Check whether an NVIDIA GPU is available by running `nvidia-smi`.
+
+    The result is cached, so the check runs at most once per process.
+
+    Returns:
+        bool: True if `nvidia-smi` ran successfully.
+    """
+    try:
+        return subprocess.run(['nvidia-smi'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+    except OSError:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_supports_nvenc():
+    """
+    Check whether the installed FFmpeg build has the NVENC H.264 encoder and CUDA decoding.
+
+    The result is cached, so the check runs at most once per process.
+
+    Returns:
+        bool: True if FFmpeg lists the `h264_nvenc` encoder and the `cuda` hwaccel.
+    """
+    try:
+        encoders = subprocess.run(['ffmpeg', '-hide_banner', '-encoders'],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+        hwaccels = subprocess.run(['ffmpeg', '-hide_banner', '-hwaccels'],
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+    except OSError:
+        return False
+    return 'h264_nvenc' in encoders.split() and 'cuda' in hwaccels.split()
+
+
 class HLSManager:
     """
     HLSManager handles the conversion, encryption, and decryption of HLS streams.
+
+    Attributes:
+        use_gpu (bool): Whether to decode and encode on an NVIDIA GPU (NVDEC/NVENC). None detects a usable GPU on first use.
     """
-    def __init__(self):
-        pass
+    def __init__(self, use_gpu=None):
+        """
+        Initialize HLSManager.
+
+        Args:
+            **use_gpu** (bool, optional): Whether to decode and encode on an NVIDIA GPU. Defaults to None, which uses the GPU if `nvidia-smi` finds one and FFmpeg was built with NVENC and CUDA support.
+        """
+        self.use_gpu = use_gpu
+
+    def _gpu_enabled(self):
+        """
+        Helper function to resolve whether FFmpeg should use the NVIDIA GPU.
+
+        Returns:
+            bool: True if decoding and encoding should run on the GPU.
+        """
+        if self.use_gpu is None:
+            self.use_gpu = _nvidia_gpu_available() and _ffmpeg_supports_nvenc()
+        return self.use_gpu
+
+    def _input_args(self, input_file):
+        """
+        Helper function to build the FFmpeg input arguments, with CUDA decoding when the GPU is enabled.
+
+        Args:
+            **input_file** (str): Path to the input file.
+
+        Returns:
+            list: FFmpeg arguments for the input.
+        """
+        if self._gpu_enabled():
+            return ['-hwaccel', 'cuda', '-hwaccel_output_format', 'cuda', '-i', input_file]
+        return ['-i', input_file]
 
     def generate_key(self):
         """
@@ -52,7 +123,42 @@ class HLSManager:
         self.key = get_random_bytes(16)
         return self.key
 
-    def convert_to_hls(self, input_file, output_dir, key_info_file=None):
+    def _encoder_args(self, preset=None):
+        """
+        Helper function to build the video encoder arguments for FFmpeg.
+
+        NVENC is used with its fastest preset when the GPU is enabled; otherwise libx264.
+
+        Args:
+            **preset** (str, optional): x264 preset (e.g. 'ultrafast'), which also fixes the keyframe interval (the only part applied on the GPU). Defaults to None.
+
+        Returns:
+            list: FFmpeg arguments selecting and configuring the video encoder.
+        """
+        if self._gpu_enabled():
+            encoder_args = ['-c:v', 'h264_nvenc', '-preset', 'p1', '-rc', 'vbr']
+            if preset:
+                encoder_args += ['-no-scenecut', '1', '-g', '48', '-keyint_min', '48']
+            return encoder_args
+
+        encoder_args = ['-c:v', 'libx264']
+        if preset:
+            encoder_args += ['-preset', preset, '-sc_threshold', '0', '-g', '48', '-keyint_min', '48']
+        return encoder_args
+
+    def _filter_thread_args(self, threads=0):
+        """
+        Helper function to build the global FFmpeg arguments for filter graph threading.
+
+        Args:
+            **threads** (int, optional): Number of filter threads, 0 to use all cores. Defaults to 0.
+
+        Returns:
+            list: FFmpeg arguments setting the filter and filter_complex thread counts.
+        """
+        return ['-filter_threads', str(threads), '-filter_complex_threads', str(threads)]
+
+    def convert_to_hls(self, input_file, output_dir, key_info_file=None, preset=None, threads=0):
         """
         Convert a video to HLS, with optional encryption.
 
@@ -60,17 +166,23 @@ class HLSManager:
             **input_file** (str): Path to the input video file.
             **output_dir** (str): Directory where the output HLS files will be saved.
             **key_info_file** (str, optional): Path to the key info file for encryption. Defaults to None.
+            **preset** (str, optional): x264 preset to encode with (e.g. 'ultrafast'). Defaults to None.
+            **threads** (int, optional): Number of encoder and filter threads, 0 to use all cores. Defaults to 0.
         """
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
+        if key_info_file:
+            key_info_file = key_info_file.replace("\\", "/")
+
         output_m3u8 = os.path.join(output_dir, 'output.m3u8').replace("\\", "/")
-        ffmpeg_cmd = ['ffmpeg', '-i', input_file, '-hls_playlist_type', 'vod', '-hls_time', '10', output_m3u8]
+        ffmpeg_cmd = ['ffmpeg', *self._filter_thread_args(threads), *self._input_args(input_file)]
 
         if key_info_file:
-            key_info_file = key_info_file.replace("\\", "/")
-            ffmpeg_cmd.insert(3, '-hls_key_info_file')
-            ffmpeg_cmd.insert(4, key_info_file)
+            ffmpeg_cmd += ['-hls_key_info_file', key_info_file]
+
+        ffmpeg_cmd += ['-threads', str(threads), *self._encoder_args(preset),
+                       '-hls_playlist_type', 'vod', '-hls_time', '10', output_m3u8]
 
         print(f"Running FFmpeg command: {' '.join(ffmpeg_cmd)}")
         subprocess.run(ffmpeg_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -80,6 +192,8 @@ class HLSManager:
         """
         Encrypt an existing HLS stream using FFmpeg.
 
+        The streams are copied without re-encoding, so only the segments are rewritten and encrypted.
+
         Args:
             **playlist_file** (str): Path to the HLS playlist file.
             **key_file** (str): Path to the AES key file.
@@ -96,6 +210,7 @@ class HLSManager:
 
         ffmpeg_cmd = [
             'ffmpeg', '-i', playlist_file,
+            '-c', 'copy',
             '-hls_key_info_file', key_info_file,
             '-hls_playlist_type', 'vod',
             '-hls_time', '10',
@@ -132,11 +247,14 @@ class HLSManager:
         Args:
             **input_playlist** (str): Path to the encrypted HLS playlist.
             **output_file** (str): Path to save the decrypted video.
-            **decryption_key_hex** (str): Hex-encoded decryption key.
-            **iv_hex** (str, optional): Initialization vector (IV) for decryption. Defaults to None.
+            **decryption_key_hex** (str or bytes): Hex-encoded decryption key, or the raw key bytes.
+            **iv_hex** (str or bytes, optional): Initialization vector (IV) for decryption, hex-encoded or as raw bytes. Defaults to None.
         """
+        # FFmpeg takes the key and IV as hex, so raw bytes are encoded only once here
         if isinstance(decryption_key_hex, bytes):
             decryption_key_hex = decryption_key_hex.hex()
+        if isinstance(iv_hex, bytes):
+            iv_hex = iv_hex.hex()
 
         ffmpeg_cmd = [
             'ffmpeg', '-allowed_extensions', 'ALL',
@@ -32,12 +32,131 @@ Author: [Your Name]
 """
 
 import cv2
+import numpy as np
 import os
-from datetime import timedelta
-from PIL import Image
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from thumbtrail.aesmanager import AESManager
 from thumbtrail.hlsmanager import HLSManager
 
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJSAMP_420
+except ImportError:  # PyTurboJPEG is optional; JPEG images are then encoded with OpenCV
+    TurboJPEG = None
+
+# Start Of Image marker that begins every JPEG frame in an MJPEG pipe
+JPEG_SOI = b'\xff\xd8\xff'
+
+# JPEG quality used with libjpeg-turbo, matching OpenCV's default
+JPEG_QUALITY = 95
+
+# Lossy WebP quality used for thumbnails and merged images
+WEBP_QUALITY = 80
+
+# Largest width or height a WebP image can have
+WEBP_MAX_DIMENSION = 16383
+
+# Number of thumbnails per row in the merged image
+MERGE_COLUMNS = 5
+
+# Shared libjpeg-turbo encoder, created on first use
+_jpeg_encoder = None
+
+# Set once libjpeg-turbo fails to load, so loading is not retried
+_jpeg_encoder_failed = False
+
+
+def _tile_thumbnails(sprite, thumbnails, columns):
+    """
+    Copy each thumbnail into its cell of the sprite image, row by row.
+
+    Args:
+        **sprite** (numpy.ndarray): Destination image of shape (rows * height, columns * width, 3).
+        **thumbnails** (numpy.ndarray): Thumbnails of shape (count, height, width, 3).
+        **columns** (int): Number of thumbnails per row.
+    """
+    height = thumbnails.shape[1]
+    width = thumbnails.shape[2]
+    for i in range(thumbnails.shape[0]):
+        row = i // columns
+        col = i % columns
+        sprite[row * height:(row + 1) * height, col * width:(col + 1) * width, :] = thumbnails[i]
+
+
+def _get_jpeg_encoder():
+    """
+    Get the shared libjpeg-turbo encoder, creating it on first use.
+
+    Returns:
+        TurboJPEG: The encoder, or None if PyTurboJPEG or libjpeg-turbo is not available.
+    """
+    global _jpeg_encoder, _jpeg_encoder_failed
+    if _jpeg_encoder is None and TurboJPEG is not None and not _jpeg_encoder_failed:
+        try:
+            _jpeg_encoder = TurboJPEG()
+        except (OSError, RuntimeError):
+            print("Warning: libjpeg-turbo could not be loaded. Falling back to OpenCV for JPEG encoding.")
+            _jpeg_encoder_failed = True
+    return _jpeg_encoder
+
+
+def _write_file(file_path, data):
+    """
+    Write bytes-like data to a file.
+
+    Args:
+        **file_path** (str): Path of the file to write.
+        **data** (bytes): Data to write.
+    """
+    with open(file_path, "wb") as f:
+        f.write(data)
+
+
+class _BatchWriter:
+    """
+    Writes many small files in the background on a thread pool.
+
+    Up to twice the CPU count of writes are kept in flight. Once that depth is reached the
+    pending batch is waited on, so memory stays bounded and write errors are raised.
+    """
+    def __init__(self):
+        self.max_pending = (os.cpu_count() or 1) * 2
+        self.executor = ThreadPoolExecutor(max_workers=self.max_pending)
+        self.pending = []
+
+    def submit(self, file_path, data):
+        """
+        Queue a file write.
+
+        Args:
+            **file_path** (str): Path of the file to write.
+            **data** (bytes): Data to write.
+        """
+        self.pending.append(self.executor.submit(_write_file, file_path, data))
+        if len(self.pending) >= self.max_pending:
+            self.flush()
+
+    def flush(self):
+        """
+        Wait for all queued writes and raise the first error, if any.
+        """
+        wait(self.pending)
+        pending, self.pending = self.pending, []
+        for future in pending:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            # A write error raised here would hide an exception that is already propagating
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.executor.shutdown()
+
 
 class Scrubber:
     """
@@ -65,22 +184,43 @@ class Scrubber:
         if not os.path.exists(self.output_path):
             os.makedirs(self.output_path)
 
-    def _format_time(self, seconds):
+    def _format_times(self, seconds):
         """
-        Helper function to format time in WebVTT format (HH:MM:SS.mmm).
+        Helper function to format times in WebVTT format (HH:MM:SS.mmm).
+
+        The time components are computed for all times at once with NumPy.
 
         Args:
-            **seconds** (int): Time in seconds.
+            **seconds** (list): Times in seconds.
 
         Returns:
-            str: Time formatted in WebVTT format.
+            list: Times formatted in WebVTT format.
+        """
+        milliseconds = np.round(np.asarray(seconds, dtype=np.float64) * 1000).astype(np.int64)
+        hours, milliseconds = np.divmod(milliseconds, 3600000)
+        minutes, milliseconds = np.divmod(milliseconds, 60000)
+        secs, milliseconds = np.divmod(milliseconds, 1000)
+        return [f'{h:02}:{m:02}:{s:02}.{ms:03}'
+                for h, m, s, ms in zip(hours.tolist(), minutes.tolist(), secs.tolist(), milliseconds.tolist())]
+
+    def _write_webvtt(self, vtt_file_path, cues, interval):
+        """
+        Helper function to write the WebVTT file in a single write.
+
+        Args:
+            **vtt_file_path** (str): Path to save the WebVTT file.
+            **cues** (list): Tuples of cue start time (in seconds) and thumbnail reference.
+            **interval** (int): Duration of each cue (in seconds).
         """
-        td = timedelta(seconds=seconds)
-        total_seconds = int(td.total_seconds())
-        hours, remainder = divmod(total_seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
-        milliseconds = int((td.total_seconds() - total_seconds) * 1000)
-        return f'{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}'
+        starts = np.array([sec for sec, _ in cues], dtype=np.float64)
+        start_times = self._format_times(starts)
+        end_times = self._format_times(starts + interval)
+
+        with open(vtt_file_path, "w") as vtt_file:
+            vtt_file.write("WEBVTT\n\n" + "".join(
+                f"{start_time} --> {end_time}\n{target}\n\n"
+                for start_time, end_time, (_, target) in zip(start_times, end_times, cues)
+            ))
 
     def _read_key(self, key_file):
         """
@@ -124,6 +264,28 @@ class Scrubber:
 
         return decrypted_video_path
 
+    def _encode_image(self, image, image_format):
+        """
+        Helper function to encode an image, using libjpeg-turbo for JPEG images when it is available.
+        WebP images are encoded lossy at `WEBP_QUALITY`.
+
+        Args:
+            **image** (numpy.ndarray): Image array in BGR order.
+            **image_format** (str): Format of the image (e.g. "jpg", "png", "webp").
+
+        Returns:
+            bytes: The encoded image (bytes-like).
+        """
+        jpeg_encoder = _get_jpeg_encoder() if image_format.lower() in ("jpg", "jpeg") else None
+        if jpeg_encoder is not None:
+            return jpeg_encoder.encode(image, quality=JPEG_QUALITY, pixel_format=TJPF_BGR, jpeg_subsample=TJSAMP_420)
+
+        params = [cv2.IMWRITE_WEBP_QUALITY, WEBP_QUALITY] if image_format.lower() == "webp" else []
+        success, encoded = cv2.imencode(f".{image_format}", image, params)
+        if not success:
+            raise ValueError(f"Unable to encode image as {image_format}")
+        return encoded
+
     def _merge_thumbnails(self, thumbnail_list, thumbnail_size, output_image_path):
         """
         Helper function to merge thumbnails into a single image.
@@ -136,41 +298,116 @@ class Scrubber:
         Returns:
             list: Coordinates of each thumbnail in the merged image.
         """
-        columns = 5
+        columns = MERGE_COLUMNS
         rows = (len(thumbnail_list) + columns - 1) // columns
-        merged_image = Image.new("RGB", (columns * thumbnail_size[0], rows * thumbnail_size[1]))
-
-        coordinates = []
-        for i, thumbnail_array in enumerate(thumbnail_list):
-            thumbnail_rgb = cv2.cvtColor(thumbnail_array, cv2.COLOR_BGR2RGB)
-            thumbnail = Image.fromarray(thumbnail_rgb)
-            row = i // columns
-            col = i % columns
-            merged_image.paste(thumbnail, (col * thumbnail_size[0], row * thumbnail_size[1]))
-            coordinates.append((col * thumbnail_size[0], row * thumbnail_size[1]))
-
-        merged_image.save(output_image_path)
+        thumbnails = np.ascontiguousarray(np.stack(thumbnail_list), dtype=np.uint8)
+        merged_image = np.zeros((rows * thumbnail_size[1], columns * thumbnail_size[0], 3), dtype=np.uint8)
+
+        _tile_thumbnails(merged_image, thumbnails, columns)
+
+        coordinates = [((i % columns) * thumbnail_size[0], (i // columns) * thumbnail_size[1])
+                       for i in range(len(thumbnail_list))]
+
+        _write_file(output_image_path, self._encode_image(merged_image, os.path.splitext(output_image_path)[1][1:]))
         return coordinates
 
+    def _read_thumbnails(self, video, fps, duration, interval, thumbnail_size):
+        """
+        Helper function to read thumbnails by seeking to each interval with OpenCV.
+
+        Args:
+            **video** (cv2.VideoCapture): Opened video capture, released once all thumbnails are read.
+            **fps** (float): Frame rate of the video.
+            **duration** (float): Duration of the video (in seconds).
+            **interval** (int): Time interval between thumbnails (in seconds).
+            **thumbnail_size** (tuple): Size of each thumbnail.
+
+        Yields:
+            tuple: Time of the thumbnail (in seconds) and the thumbnail image array.
+        """
+        try:
+            for sec in range(0, int(duration), interval):
+                frame_number = int(fps * sec)
+                video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                success, frame = video.read()
+
+                if not success:
+                    print(f"Warning: Could not read frame at {sec} seconds")
+                    continue
+
+                yield sec, cv2.resize(frame, thumbnail_size)
+        finally:
+            video.release()
+
+    def _pipe_thumbnails(self, video_path, duration, interval, thumbnail_size):
+        """
+        Helper function to extract all thumbnails with a single FFmpeg process.
+
+        FFmpeg samples one frame per interval, scales it and streams the frames as
+        JPEG images over its stdout, which are split on the JPEG start-of-image marker.
+
+        Args:
+            **video_path** (str): Path to the video file.
+            **duration** (float): Duration of the video (in seconds).
+            **interval** (int): Time interval between thumbnails (in seconds).
+            **thumbnail_size** (tuple): Size of each thumbnail.
+
+        Yields:
+            tuple: Time of the thumbnail (in seconds) and the JPEG-encoded thumbnail.
+        """
+        ffmpeg_cmd = [
+            'ffmpeg', '-loglevel', 'error',
+            '-i', video_path,
+            '-vf', f'fps=1/{interval},scale={thumbnail_size[0]}:{thumbnail_size[1]}',
+            # Stop at the same thumbnail the seeking path ends on
+            '-frames:v', str(len(range(0, int(duration), interval))),
+            '-f', 'image2pipe', '-vcodec', 'mjpeg', '-q:v', '2',
+            'pipe:1'
+        ]
+        print(f"Running FFmpeg command: {' '.join(ffmpeg_cmd)}")
+        process = subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE)
+
+        buffer = bytearray()
+        index = 0
+        try:
+            for chunk in iter(lambda: process.stdout.read1(65536), b''):
+                buffer += chunk
+                end = buffer.find(JPEG_SOI, 1)
+                while end != -1:
+                    yield index * interval, bytes(buffer[:end])
+                    index += 1
+                    del buffer[:end]
+                    end = buffer.find(JPEG_SOI, 1)
+
+            # The last frame is only known to be complete if FFmpeg exited cleanly
+            if process.wait() != 0:
+                print(f"Warning: FFmpeg exited with code {process.returncode} while extracting thumbnails")
+            elif buffer:
+                yield index * interval, bytes(buffer)
+        finally:
+            # Stop FFmpeg if the thumbnails were not all consumed
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            process.wait()
+
     def generate_thumbnails_and_webvtt(self, interval=5, thumbnail_size=(160, 90),
                                        image_format="jpg", should_merge_thumbnails=False,
-                                       use_absolute_paths=False, thumbnail_url=None):
+                                       use_absolute_paths=False, thumbnail_url=None,
+                                       batch_mode=False):
         """
         Generate thumbnails and WebVTT for a video.
 
         Args:
             **interval** (int, optional): Time interval between thumbnails (in seconds). Defaults to 5.
             **thumbnail_size** (tuple, optional): Size of each thumbnail. Defaults to (160, 90).
-            **image_format** (str, optional): Format for thumbnail images. Defaults to "jpg".
-            **should_merge_thumbnails** (bool, optional): Whether to merge all thumbnails into one image. Defaults to False.
+            **image_format** (str, optional): Format for thumbnail images (e.g. "jpg", "png", "webp"). Defaults to "jpg".
+            **should_merge_thumbnails** (bool, optional): Whether to merge all thumbnails into one image. A WebP merged image larger than 16383 px is saved as JPEG instead. Defaults to False.
             **use_absolute_paths** (bool, optional): Whether to use absolute paths in WebVTT. Defaults to False.
             **thumbnail_url** (str, optional): URL prefix for thumbnails in WebVTT. Defaults to None.
+            **batch_mode** (bool, optional): Whether to extract all thumbnails with a single FFmpeg process instead of seeking to each interval. Defaults to False.
         """
         decrypted_video_path = self._decrypt_video_if_needed()
-
-        vtt_file_path = os.path.join(self.output_path, f"{os.path.splitext(os.path.basename(decrypted_video_path))[0]}.vtt")
-        thumbnail_list = []
-
         video = cv2.VideoCapture(decrypted_video_path)
 
         if not video.isOpened():
@@ -181,26 +418,40 @@ class Scrubber:
         total_frames = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
         duration = total_frames / fps
 
-        with open(vtt_file_path, "w") as vtt_file:
-            vtt_file.write("WEBVTT\n\n")
-
-            for sec in range(0, int(duration), interval):
-                frame_number = int(fps * sec)
-                video.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-                success, frame = video.read()
-
-                if not success:
-                    print(f"Warning: Could not read frame at {sec} seconds")
-                    continue
-
-                thumbnail = cv2.resize(frame, thumbnail_size)
+        vtt_file_path = os.path.join(self.output_path, f"{os.path.splitext(os.path.basename(decrypted_video_path))[0]}.vtt")
+        thumbnail_list = []
+        thumbnail_secs = []
+        cues = []
+
+        if batch_mode:
+            video.release()
+            thumbnails = self._pipe_thumbnails(decrypted_video_path, duration, interval, thumbnail_size)
+        else:
+            thumbnails = self._read_thumbnails(video, fps, duration, interval, thumbnail_size)
+
+        # Thumbnail files are written in the background while the next frames are extracted;
+        # merged thumbnails are kept in memory, so no writer is needed for them
+        with nullcontext() if should_merge_thumbnails else _BatchWriter() as writer:
+            for sec, thumbnail in thumbnails:
+                # Frames piped from FFmpeg are already JPEG-encoded, and are only decoded when needed
+                is_encoded = isinstance(thumbnail, bytes)
+                if is_encoded and (should_merge_thumbnails or image_format.lower() not in ("jpg", "jpeg")):
+                    thumbnail = cv2.imdecode(np.frombuffer(thumbnail, np.uint8), cv2.IMREAD_COLOR)
+                    if thumbnail is None:
+                        print(f"Warning: Could not decode frame at {sec} seconds")
+                        continue
+                    is_encoded = False
 
                 if should_merge_thumbnails:
                     thumbnail_list.append(thumbnail)
+                    thumbnail_secs.append(sec)
                 else:
                     thumbnail_filename = f"thumbnail_{sec}.{image_format}"
                     thumbnail_filepath = os.path.join(self.output_path, thumbnail_filename)
-                    cv2.imwrite(thumbnail_filepath, thumbnail)
+                    if is_encoded:
+                        writer.submit(thumbnail_filepath, thumbnail)
+                    else:
+                        writer.submit(thumbnail_filepath, self._encode_image(thumbnail, image_format))
                     thumbnail_list.append(thumbnail_filepath)
 
                     if thumbnail_url:
@@ -210,24 +461,23 @@ class Scrubber:
                     else:
                         thumbnail_path_in_vtt = os.path.abspath(thumbnail_filepath) if use_absolute_paths else os.path.basename(thumbnail_filepath)
 
-                    start_time = self._format_time(sec)
-                    end_time = self._format_time(sec + interval)
-                    vtt_file.write(f"{start_time} --> {end_time}\n")
-                    vtt_file.write(f"{thumbnail_path_in_vtt}\n\n")
+                    cues.append((sec, thumbnail_path_in_vtt))
+
+        if should_merge_thumbnails and thumbnail_list:
+            merged_format = image_format
+            rows = (len(thumbnail_list) + MERGE_COLUMNS - 1) // MERGE_COLUMNS
+            if merged_format.lower() == "webp" and max(rows * thumbnail_size[1], MERGE_COLUMNS * thumbnail_size[0]) > WEBP_MAX_DIMENSION:
+                print("Warning: Merged image is too large for WebP. Saving it as JPEG instead.")
+                merged_format = "jpg"
+            merged_image_path = os.path.join(self.output_path, f"merged_thumbnails.{merged_format}")
+            coordinates = self._merge_thumbnails(thumbnail_list, thumbnail_size, merged_image_path)
+            merged_image_path_in_vtt = os.path.abspath(merged_image_path) if use_absolute_paths else os.path.basename(merged_image_path)
 
-            if should_merge_thumbnails:
-                merged_image_path = os.path.join(self.output_path, f"merged_thumbnails.{image_format}")
-                coordinates = self._merge_thumbnails(thumbnail_list, thumbnail_size, merged_image_path)
-                merged_image_path_in_vtt = os.path.abspath(merged_image_path) if use_absolute_paths else os.path.basename(merged_image_path)
+            for sec, (x, y) in zip(thumbnail_secs, coordinates):
+                cues.append((sec, f"{merged_image_path_in_vtt}#xywh={x},{y},{thumbnail_size[0]},{thumbnail_size[1]}"))
 
-                for i, sec in enumerate(range(0, int(duration), interval)):
-                    start_time = self._format_time(sec)
-                    end_time = self._format_time(sec + interval)
-                    x, y = coordinates[i]
-                    vtt_file.write(f"{start_time} --> {end_time}\n")
-                    vtt_file.write(f"{merged_image_path_in_vtt}#xywh={x},{y},{thumbnail_size[0]},{thumbnail_size[1]}\n\n")
+        self._write_webvtt(vtt_file_path, cues, interval)
 
-        video.release()
         print(f"Thumbnails and WebVTT file generated in {self.output_path}")
 
         if self.decryption_method: